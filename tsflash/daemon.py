@@ -7,6 +7,7 @@ import sys
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import IntEnum
 from typing import Dict, List, Optional, Set
 
 from .config import DaemonConfig, load_config
@@ -16,14 +17,26 @@ from .rpiboot import run_rpiboot
 
 logger = logging.getLogger(__name__)
 
+
+class PortState(IntEnum):
+    """States of a monitored downstream port (integers for cheap comparison)."""
+    NOT_CONNECTED = 0
+    UNKNOWN = 1
+    BOOTING = 2
+    WAITING = 3
+    FLASHING = 4
+    COMPLETED = 5
+    FAILED = 6
+
+
 # Port state constants
-NOT_CONNECTED = 'not_connected'
-UNKNOWN = 'unknown'
-BOOTING = 'booting'
-WAITING = 'waiting'
-FLASHING = 'flashing'
-COMPLETED = 'completed'
-FAILED = 'failed'
+NOT_CONNECTED = PortState.NOT_CONNECTED
+UNKNOWN = PortState.UNKNOWN
+BOOTING = PortState.BOOTING
+WAITING = PortState.WAITING
+FLASHING = PortState.FLASHING
+COMPLETED = PortState.COMPLETED
+FAILED = PortState.FAILED
 
 # Global flag for graceful shutdown
 _shutdown_requested = False
@@ -126,7 +139,7 @@ def find_port_for_block_device(ports_data: Dict, block_device: str, monitor_port
 
 
 def flash_device(mapped_image, device: str, block_size: str, image_path: str, 
-                 port_str: str, port_states: Dict[str, dict]) -> bool:
+                 port_str: str, port_states: Dict[str, dict], state_callback=None) -> bool:
     """
     Flash a device with the configured image.
     
@@ -137,6 +150,8 @@ def flash_device(mapped_image, device: str, block_size: str, image_path: str,
         image_path: Path string for logging
         port_str: USB port string for this device
         port_states: Shared dictionary to update with port state information
+        state_callback: Optional callback function() -> None called when the port
+                        state changes or progress advances by at least 1%.
         
     Returns:
         True if successful, False otherwise
@@ -161,8 +176,11 @@ def flash_device(mapped_image, device: str, block_size: str, image_path: str,
         'start_time': time.time()
     }
     
+    last_reported_percent = 0.0
+    
     def progress_callback(bytes_written: int, total_bytes: int, percent: float):
         """Callback to update progress in port state."""
+        nonlocal last_reported_percent
         if port_str in port_states:
             port_states[port_str]['progress'].update({
                 'bytes_written': bytes_written,
@@ -170,6 +188,9 @@ def flash_device(mapped_image, device: str, block_size: str, image_path: str,
                 'percent': percent
             })
             port_states[port_str]['state'] = FLASHING
+            if state_callback and percent - last_reported_percent >= 1.0:
+                last_reported_percent = percent
+                state_callback()
     
     try:
         # Use non-interactive mode to avoid progress bar interfering with logs
@@ -181,6 +202,8 @@ def flash_device(mapped_image, device: str, block_size: str, image_path: str,
             port_states[port_str]['state'] = COMPLETED
             port_states[port_str]['progress']['percent'] = 100.0
             port_states[port_str]['error'] = None
+        if state_callback:
+            state_callback()
         
         logger.info(f"Successfully flashed {device} on port {port_str}")
         return True
@@ -189,6 +212,8 @@ def flash_device(mapped_image, device: str, block_size: str, image_path: str,
         if port_str in port_states:
             port_states[port_str]['state'] = FAILED
             port_states[port_str]['error'] = str(e)
+        if state_callback:
+            state_callback()
         logger.error(f"Failed to flash {device} on port {port_str}: {e}")
         return False
 
@@ -323,7 +348,7 @@ def monitor_devices(monitor_port: str, config: DaemonConfig) -> None:
                             logger.info(f"Block device detected at port {port_str}: {block_devices}")
                             port_states[port_str] = {
                                 'state': WAITING,
-                                'block_devices': block_devices.copy(),
+                                'block_devices': list(block_devices),
                                 'detected_time': current_time,
                                 'progress': {},
                                 'error': None
@@ -380,14 +405,14 @@ def monitor_devices(monitor_port: str, config: DaemonConfig) -> None:
                             # Block device appeared after rpiboot
                             logger.info(f"Block device appeared at port {port_str} after rpiboot: {block_devices}")
                             port_states[port_str]['state'] = WAITING
-                            port_states[port_str]['block_devices'] = block_devices.copy()
+                            port_states[port_str]['block_devices'] = list(block_devices)
                             port_states[port_str]['detected_time'] = current_time
                         # If still booting and no block devices, keep waiting
                     
                     elif current_state == WAITING:
                         # Block device detected, waiting for stable_delay
                         # Update block devices list in case it changed
-                        port_states[port_str]['block_devices'] = block_devices.copy()
+                        port_states[port_str]['block_devices'] = list(block_devices)
                         
                         if not block_devices:
                             # Block device disappeared while waiting
@@ -432,11 +457,11 @@ def monitor_devices(monitor_port: str, config: DaemonConfig) -> None:
                     elif current_state == FLASHING:
                         # Flashing in progress - state updated by flash_device callback
                         # Update block devices list in case it changed
-                        port_states[port_str]['block_devices'] = block_devices.copy()
+                        port_states[port_str]['block_devices'] = list(block_devices)
                     
                     elif current_state == COMPLETED:
                         # Flash completed - wait for device removal
-                        port_states[port_str]['block_devices'] = block_devices.copy()
+                        port_states[port_str]['block_devices'] = list(block_devices)
                         if not block_devices:
                             # Device removed after completion
                             logger.info(f"Flashed device at port {port_str} has been removed")
@@ -444,7 +469,7 @@ def monitor_devices(monitor_port: str, config: DaemonConfig) -> None:
                     
                     elif current_state == FAILED:
                         # Failed state - keep tracking until device is removed
-                        port_states[port_str]['block_devices'] = block_devices.copy()
+                        port_states[port_str]['block_devices'] = list(block_devices)
                         if not block_devices:
                             # Device removed after failure
                             logger.debug(f"Failed device at port {port_str} has been removed")
@@ -456,7 +481,7 @@ def monitor_devices(monitor_port: str, config: DaemonConfig) -> None:
                             # Block device appeared - transition to waiting
                             logger.info(f"Block device appeared at port {port_str}: {block_devices}")
                             port_states[port_str]['state'] = WAITING
-                            port_states[port_str]['block_devices'] = block_devices.copy()
+                            port_states[port_str]['block_devices'] = list(block_devices)
                             port_states[port_str]['detected_time'] = current_time
                         elif port_info.get('vendor_id') is None and port_info.get('product_id') is None:
                             # Device removed
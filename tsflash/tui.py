@@ -1,6 +1,8 @@
 """Text-based UI for monitoring tsflash daemon operations."""
 
+import functools
 import logging
+import queue
 import select
 import signal
 import sys
@@ -9,8 +11,7 @@ import threading
 import time
 import tty
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
-from typing import Deque, Dict, Optional
+from typing import Deque, Dict, List, Optional
 
 from rich.console import Console
 from rich.layout import Layout
@@ -32,63 +33,123 @@ from .daemon import (
     flash_device,
 )
 from .flash import create_image_mmap
-from .usb import enumerate_all_usb_ports, filter_ports_by_limit, is_rpiboot_device
+from .usb import enumerate_all_usb_ports, filter_ports_by_limit, is_rpiboot_device, watch_usb_events
 
 logger = logging.getLogger(__name__)
 
 # Global state for TUI
 _tui_shutdown_requested = False
-_tui_port_states: Dict[str, dict] = {}
-_tui_log_buffer: Deque[str] = deque(maxlen=50)
-_tui_lock = threading.Lock()
-_tui_flash_executor: Optional[ThreadPoolExecutor] = None
+_tui_shutdown_signal: Optional[int] = None  # Signal that requested shutdown, logged by the main loop
+_tui_port_states: Dict[str, dict] = {}  # Authoritative state, owned by the monitor thread
+_tui_states_snapshot: Dict[str, dict] = {}  # Copy published each poll cycle for the render loop
+_tui_downstream_snapshot: Dict[str, dict] = {}  # Monitor port and its downstream ports, published for the render loop
+_tui_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()  # Filled by any thread, drained by the render loop
+_tui_log_buffer: Deque[logging.LogRecord] = deque(maxlen=50)  # Only touched by the render loop
+_tui_log_count = 0  # Total number of log messages received (buffer length saturates at maxlen)
+_tui_render_dirty = threading.Event()  # Set when something visible changed; wakes the render loop
+_tui_flash_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()  # flash_device() argument tuples, None stops a worker
+_TUI_FLASH_WORKERS = 10
 _tui_image_mmap = None
 
+# Log records are formatted lazily, only when they are actually displayed
+_tui_log_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+                                       datefmt='%Y-%m-%d %H:%M:%S')
+_last_log_panel_count = -1
+_last_log_panel: Optional[Panel] = None
+
+# Render cache: the layout is only rebuilt when its fingerprint changes
+_last_layout_fp = None
+_last_layout: Optional[Layout] = None
+
+# Pre-built progress bar glyphs, sliced to width instead of multiplied per row
+_BARS_FULL = "█" * 256
+_BARS_EMPTY = "░" * 256
+
+# Byte unit table indexed by bit_length() // 10 (one unit per factor of 1024)
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_BYTE_SCALES = tuple(1024.0 ** i for i in range(len(_BYTE_UNITS)))
+
+# Color per port state, and the state column markup derived from it
+_STATE_COLORS = {
+    NOT_CONNECTED: "dim white",
+    WAITING: "yellow",
+    BOOTING: "cyan",
+    FLASHING: "blue",
+    COMPLETED: "green",
+    FAILED: "red",
+    UNKNOWN: "magenta",
+}
+_STATE_MARKUP = {state: f"[{color}]{state.name}[/{color}]" for state, color in _STATE_COLORS.items()}
+
 
 class TUIHandler(logging.Handler):
     """Logging handler that captures log messages for TUI display."""
 
     def emit(self, record):
-        """Emit a log record to the buffer."""
+        """Emit a log record to the queue drained by the render loop.
+
+        The message is merged with its args here, as QueueHandler.prepare()
+        does, because args such as block device lists may change before the
+        record is shown. Only the timestamp and level formatting is deferred
+        to _create_log_panel.
+        """
         try:
-            msg = self.format(record)
-            with _tui_lock:
-                _tui_log_buffer.append(msg)
+            record.msg = record.getMessage()
+            record.args = None
+            _tui_log_queue.put_nowait(record)
+            if not _tui_render_dirty.is_set():
+                _tui_render_dirty.set()
         except Exception:
             self.handleError(record)
 
 
+def _drain_log_queue() -> None:
+    """Move queued log records into the display buffer (render loop only)."""
+    global _tui_log_count
+    while True:
+        try:
+            record = _tui_log_queue.get_nowait()
+        except queue.Empty:
+            break
+        _tui_log_buffer.append(record)
+        _tui_log_count += 1
+
+
 def _signal_handler(signum, frame):
-    """Handle shutdown signals."""
-    global _tui_shutdown_requested
-    logger.info(f"Received signal {signum}, initiating graceful shutdown...")
+    """Handle shutdown signals.
+
+    Only flags are set here: logging or setting an Event takes locks the
+    interrupted main thread may already hold. The render loop notices the
+    flag within its wait timeout.
+    """
+    global _tui_shutdown_requested, _tui_shutdown_signal
+    _tui_shutdown_signal = signum
     _tui_shutdown_requested = True
 
 
 def _format_bytes(bytes_value: int) -> str:
     """Format bytes as human-readable string."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.1f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.1f} PB"
-
-
-def _get_state_color(state: str) -> str:
-    """Get color for port state."""
-    colors = {
-        NOT_CONNECTED: "dim white",
-        WAITING: "yellow",
-        BOOTING: "cyan",
-        FLASHING: "blue",
-        COMPLETED: "green",
-        FAILED: "red",
-        UNKNOWN: "magenta",
-    }
-    return colors.get(state, "white")
+    return _format_bytes_cached(int(bytes_value))
+
 
+@functools.lru_cache(maxsize=256)
+def _format_bytes_cached(bytes_value: int) -> str:
+    """Format a whole number of bytes as human-readable string (memoized)."""
+    idx = min(max(0, (bytes_value.bit_length() - 1) // 10), len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / _BYTE_SCALES[idx]:.1f} {_BYTE_UNITS[idx]}"
 
-def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_port: Optional[str], config: DaemonConfig, console_width: Optional[int] = None) -> Table:
+
+def _displayed_ports(ports_data: Dict, monitor_port: Optional[str]) -> List[str]:
+    """Get the ports to display (excluding the monitor port itself).
+
+    ports_data is expected to be already limited to the monitor port's
+    downstream ports, as published by the monitor thread, and is already in
+    natural port order (1-1.2 before 1-1.10), which is kept.
+    """
+    return [p for p in ports_data if p != monitor_port]
+
+
+def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_port: Optional[str], config: DaemonConfig, console_width: Optional[int] = None, sorted_ports: Optional[List[str]] = None) -> Table:
     """Create table showing port states."""
     # Build title: <program name> @ USB Port <port location> (manufacturer / product name), <image path>
     title_parts = ["tsflash"]
@@ -113,6 +174,9 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
     
     title = " ".join(title_parts)
     
+    # Single clock reading shared by every row of this table
+    now = time.time()
+    
     table = Table(
         show_header=True,
         header_style="bold magenta",
@@ -127,16 +191,9 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
     table.add_column("Device", style="yellow")
     table.add_column("Info", style="dim", ratio=3, no_wrap=True)
     
-    # Get all downstream ports (excluding the monitor port itself)
-    if monitor_port:
-        downstream_ports = filter_ports_by_limit(ports_data, monitor_port)
-        # Remove the monitor port itself from the list
-        all_port_strings = {k: v for k, v in downstream_ports.items() if k != monitor_port}
-    else:
-        all_port_strings = ports_data
-    
-    # Sort ports for consistent display
-    sorted_ports = sorted(all_port_strings.keys())
+    # Get all downstream ports, sorted for consistent display
+    if sorted_ports is None:
+        sorted_ports = _displayed_ports(ports_data, monitor_port)
     
     if not sorted_ports:
         table.add_row("(none)", "[dim]No ports available[/dim]", "", "", "")
@@ -148,7 +205,7 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
         
         # If port is not in port_states, check if it's actually empty
         if port_str not in port_states:
-            port_info = all_port_strings.get(port_str, {})
+            port_info = ports_data.get(port_str, {})
             # Check if port has any device connected
             if port_info.get('vendor_id') is not None or port_info.get('product_id') is not None:
                 # Device connected but not yet tracked - show as UNKNOWN
@@ -157,10 +214,8 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
                 # Port is empty
                 state = NOT_CONNECTED
         
-        state_color = _get_state_color(state)
-        
         # Format state name
-        state_display = f"[{state_color}]{state.upper()}[/{state_color}]"
+        state_display = _STATE_MARKUP[state]
         
         # Create progress bar or status
         progress_info = port_state.get('progress', {})
@@ -178,17 +233,17 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
                 available_width = console_width - 4 - (5 * 2)  # borders + padding
                 progress_col_width = max(10, int(available_width * 3 / 8))  # Progress ratio is 3/8
                 # Reserve space for percentage text " 100.0%" (~7 chars)
-                bar_width = max(10, progress_col_width - 7)
+                bar_width = min(len(_BARS_FULL), max(10, progress_col_width - 7))
             else:
                 bar_width = 20  # Fallback to fixed width
             
             filled = int(bar_width * percent / 100.0)
-            bar = "█" * filled + "░" * (bar_width - filled)
+            bar = _BARS_FULL[:filled] + _BARS_EMPTY[:bar_width - filled]
             progress_str = f"[blue]{bar}[/blue] {percent:.1f}%"
             
             # Calculate and show speed and bytes info
-            start_time = progress_info.get('start_time', time.time())
-            elapsed_time = time.time() - start_time
+            start_time = progress_info.get('start_time', now)
+            elapsed_time = now - start_time
             
             if total_bytes > 0 and elapsed_time > 0:
                 # Calculate speed (bytes per second)
@@ -198,8 +253,8 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
             else:
                 info_text = "Initializing..."
         elif state == WAITING:
-            detected_time = port_state.get('detected_time', time.time())
-            wait_time = time.time() - detected_time
+            detected_time = port_state.get('detected_time', now)
+            wait_time = now - detected_time
             progress_str = f"[yellow]Waiting ({wait_time:.1f}s)[/yellow]"
             info_text = ""
         elif state == BOOTING:
@@ -221,7 +276,7 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
         # Block devices - get from port_state if available, otherwise from ports_data
         block_devices = port_state.get('block_devices', [])
         if not block_devices:
-            port_info = all_port_strings.get(port_str, {})
+            port_info = ports_data.get(port_str, {})
             block_devices = port_info.get('block_devices', [])
         block_devices_str = ", ".join(block_devices) if block_devices else "-"
         
@@ -231,29 +286,72 @@ def _create_ports_table(port_states: Dict[str, dict], ports_data: Dict, monitor_
 
 
 def _create_log_panel() -> Panel:
-    """Create log display panel."""
-    with _tui_lock:
-        log_lines = list(_tui_log_buffer)
+    """Create log display panel, reusing the previous one if no records arrived."""
+    global _last_log_panel_count, _last_log_panel
     
-    if not log_lines:
+    if _last_log_panel is not None and _last_log_panel_count == _tui_log_count:
+        return _last_log_panel
+    
+    log_records = list(_tui_log_buffer)
+    
+    if not log_records:
         log_content = "[dim]No log messages yet...[/dim]"
     else:
-        log_content = "\n".join(log_lines[-30:])  # Show last 30 lines
+        # Show last 30 lines
+        log_content = "\n".join(_tui_log_formatter.format(r) for r in log_records[-30:])
     
-    return Panel(log_content, title="Logs", border_style="green")
+    _last_log_panel = Panel(log_content, title="Logs", border_style="green")
+    _last_log_panel_count = _tui_log_count
+    return _last_log_panel
 
 
-def _create_layout(config: DaemonConfig, monitor_port: Optional[str], ports_data: Dict) -> Layout:
-    """Create the main TUI layout."""
-    layout = Layout()
-    
+def _layout_fingerprint(port_states: Dict[str, dict], ports_data: Dict, monitor_port: Optional[str], console_size: tuple) -> tuple:
+    """Build a lightweight fingerprint of everything the layout displays.
+
+    The console size is included because the logs pane fills whatever
+    height is left, so a height-only resize also needs a redraw.
+    """
+    rows = []
+    time_dependent = False
+    for port_str, port_state in port_states.items():
+        state = port_state.get('state')
+        progress = port_state.get('progress') or {}
+        rows.append((
+            port_str,
+            state,
+            progress.get('bytes_written', 0),
+            progress.get('total_bytes', 0),
+            tuple(port_state.get('block_devices', ())),
+            port_state.get('boot_stage'),
+            port_state.get('error'),
+        ))
+        # Waiting time and flash speed change with the clock alone
+        if state == WAITING or state == FLASHING:
+            time_dependent = True
+
+    devices = tuple(
+        (port_str, info.get('vendor_id'), info.get('product_id'), tuple(info.get('block_devices', ())))
+        for port_str, info in sorted(ports_data.items())
+    )
+
+    clock = round(time.time(), 1) if time_dependent else None
+    return (console_size, monitor_port, tuple(sorted(rows)), devices, _tui_log_count, clock)
+
+
+def _create_layout(config: DaemonConfig, monitor_port: Optional[str], ports_data: Dict, console: Console) -> Layout:
+    """Create the main TUI layout, reusing the previous one if nothing changed."""
+    global _last_layout_fp, _last_layout
+
     # Get console width for calculations
-    try:
-        console = Console()
-        console_width = console.width
-    except Exception:
-        console_width = 80  # Fallback to reasonable default
-    
+    console_width = console.width
+
+    _drain_log_queue()
+    fp = _layout_fingerprint(_tui_states_snapshot, ports_data, monitor_port, tuple(console.size))
+    if fp == _last_layout_fp and _last_layout is not None:
+        return _last_layout
+
+    layout = Layout()
+
     # Build title to check if it wraps
     title_parts = ["tsflash"]
     if monitor_port:
@@ -278,13 +376,9 @@ def _create_layout(config: DaemonConfig, monitor_port: Optional[str], ports_data
     # Calculate sizes dynamically
     # Ports table: number of ports + table overhead (header row + box borders + title lines)
     # Get all downstream ports (excluding the monitor port itself)
-    if monitor_port:
-        downstream_ports = filter_ports_by_limit(ports_data, monitor_port)
-        all_port_strings = {k: v for k, v in downstream_ports.items() if k != monitor_port}
-    else:
-        all_port_strings = ports_data
+    sorted_ports = _displayed_ports(ports_data, monitor_port)
     
-    num_ports = len(all_port_strings) if all_port_strings else 1  # At least 1 row for "(none)"
+    num_ports = len(sorted_ports) if sorted_ports else 1  # At least 1 row for "(none)"
     # Base overhead: borders (2) + separators (2) + header (1) = 5, plus title lines
     ports_size = num_ports + 5 + (title_lines - 1)  # Subtract 1 because base overhead already includes 1 title line
     
@@ -295,16 +389,206 @@ def _create_layout(config: DaemonConfig, monitor_port: Optional[str], ports_data
     )
     
     # Ports table - use console width for dynamic progress bar sizing
-    ports_table = _create_ports_table(_tui_port_states, ports_data, monitor_port, config, console_width)
+    ports_table = _create_ports_table(_tui_states_snapshot, ports_data, monitor_port, config, console_width, sorted_ports)
     layout["ports"].update(ports_table)
     
     # Logs panel
     log_panel = _create_log_panel()
     layout["logs"].update(log_panel)
-    
+
+    _last_layout_fp = fp
+    _last_layout = layout
     return layout
 
 
+def _update_block_devices(port_state: dict, block_devices) -> None:
+    """Store block devices on a port state as a tuple, keeping the old one if unchanged."""
+    new_block_devices = tuple(block_devices)
+    if new_block_devices != port_state.get('block_devices'):
+        port_state['block_devices'] = new_block_devices
+
+
+def _flash_worker() -> None:
+    """Run queued flash jobs until a None sentinel is received."""
+    while True:
+        job = _tui_flash_queue.get()
+        if job is None:
+            return
+        try:
+            flash_device(*job)
+        except Exception as e:
+            logger.error("Unexpected error in flash worker: %s", e)
+
+
+def _handle_not_connected(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """Port was empty or newly detected."""
+    if block_devices:
+        # Block device detected directly
+        logger.info("Block device detected at port %s: %s", port_str, block_devices)
+        _tui_port_states[port_str] = {
+            'state': WAITING,
+            'block_devices': tuple(block_devices),
+            'detected_time': current_time,
+            'progress': {},
+            'error': None
+        }
+    elif is_rpiboot_device(port_info):
+        # rpiboot-compatible device detected (no block devices yet)
+        logger.info("rpiboot-compatible device detected at port %s, starting rpiboot", port_str)
+        _tui_port_states[port_str] = {
+            'state': BOOTING,
+            'block_devices': (),
+            'detected_time': current_time,
+            'progress': {},
+            'error': None,
+            'boot_stage': 'Starting rpiboot...'
+        }
+        
+        # Execute rpiboot in background thread with stage tracking
+        def handle_rpiboot_completion(port: str, states: Dict[str, dict]):
+            # Create stage callback to update boot_stage in port state
+            def stage_callback(stage: str):
+                if port in states:
+                    states[port]['boot_stage'] = stage
+            
+            try:
+                success = boot_rpiboot_device(port, timeout=60.0, stage_callback=stage_callback)
+                if port in states:
+                    if success:
+                        logger.info("rpiboot completed successfully for port %s, waiting for block device", port)
+                    else:
+                        states[port]['state'] = FAILED
+                        states[port]['error'] = 'rpiboot failed'
+                        logger.error("rpiboot failed for port %s", port)
+            except Exception as e:
+                if port in states:
+                    states[port]['state'] = FAILED
+                    states[port]['error'] = str(e)
+                logger.error("Unexpected error during rpiboot for port %s: %s", port, e)
+        
+        # Start rpiboot in background thread
+        threading.Thread(
+            target=handle_rpiboot_completion,
+            args=(port_str, _tui_port_states),
+            daemon=True
+        ).start()
+    elif port_info.get('vendor_id') is not None or port_info.get('product_id') is not None:
+        # Device connected but not rpiboot and no block devices
+        _tui_port_states[port_str] = {
+            'state': UNKNOWN,
+            'block_devices': (),
+            'detected_time': current_time,
+            'progress': {},
+            'error': None
+        }
+
+
+def _handle_booting(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """rpiboot is running - check if block device appeared."""
+    if block_devices:
+        # Block device appeared after rpiboot
+        logger.info("Block device appeared at port %s after rpiboot: %s", port_str, block_devices)
+        _tui_port_states[port_str]['state'] = WAITING
+        _update_block_devices(_tui_port_states[port_str], block_devices)
+        _tui_port_states[port_str]['detected_time'] = current_time
+
+
+def _handle_waiting(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """Block device detected, waiting for stable_delay."""
+    _update_block_devices(_tui_port_states[port_str], block_devices)
+    
+    if not block_devices:
+        # Block device disappeared while waiting
+        logger.warning("Block device disappeared at port %s while waiting", port_str)
+        _tui_port_states[port_str]['state'] = NOT_CONNECTED
+        return
+    
+    # Check if stable_delay has elapsed
+    detected_time = _tui_port_states[port_str].get('detected_time', current_time)
+    time_since_detection = current_time - detected_time
+    
+    if time_since_detection < config.stable_delay:
+        return
+    
+    # Device is stable, start flashing
+    logger.info("Device at port %s is stable, starting flash operation", port_str)
+    
+    if not _tui_image_mmap:
+        logger.error("Memory-mapped image not available, cannot flash device")
+        _tui_port_states[port_str]['state'] = FAILED
+        _tui_port_states[port_str]['error'] = 'Image not available'
+        return
+    
+    # Update state to FLASHING before submitting jobs
+    _tui_port_states[port_str]['state'] = FLASHING
+    _tui_port_states[port_str]['progress'] = {
+        'bytes_written': 0,
+        'total_bytes': 0,
+        'percent': 0.0,
+        'start_time': current_time
+    }
+    
+    # Flash all block devices on this port
+    for device in block_devices:
+        _tui_flash_queue.put_nowait((
+            _tui_image_mmap,
+            device,
+            config.block_size,
+            config.image_path,
+            port_str,
+            _tui_port_states,
+            _tui_render_dirty.set
+        ))
+
+
+def _handle_flashing(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """Flashing in progress - state updated by flash_device callback."""
+    _update_block_devices(_tui_port_states[port_str], block_devices)
+
+
+def _handle_completed(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """Flash completed - wait for device removal."""
+    _update_block_devices(_tui_port_states[port_str], block_devices)
+    if not block_devices:
+        # Device removed after completion
+        logger.info("Flashed device at port %s has been removed", port_str)
+        _tui_port_states.pop(port_str, None)
+
+
+def _handle_failed(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """Failed state - keep tracking until device is removed."""
+    _update_block_devices(_tui_port_states[port_str], block_devices)
+    if not block_devices:
+        # Device removed after failure
+        logger.debug("Failed device at port %s has been removed", port_str)
+        _tui_port_states.pop(port_str, None)
+
+
+def _handle_unknown(port_str: str, port_info: dict, block_devices, current_time: float, config: DaemonConfig) -> None:
+    """Unknown device - check if it got block devices or was removed."""
+    if block_devices:
+        # Block device appeared - transition to waiting
+        logger.info("Block device appeared at port %s: %s", port_str, block_devices)
+        _tui_port_states[port_str]['state'] = WAITING
+        _update_block_devices(_tui_port_states[port_str], block_devices)
+        _tui_port_states[port_str]['detected_time'] = current_time
+    elif port_info.get('vendor_id') is None and port_info.get('product_id') is None:
+        # Device removed
+        _tui_port_states.pop(port_str, None)
+
+
+# State transition handlers for the TUI monitoring loop (same logic as daemon)
+_STATE_HANDLERS = {
+    NOT_CONNECTED: _handle_not_connected,
+    BOOTING: _handle_booting,
+    WAITING: _handle_waiting,
+    FLASHING: _handle_flashing,
+    COMPLETED: _handle_completed,
+    FAILED: _handle_failed,
+    UNKNOWN: _handle_unknown,
+}
+
+
 def _monitor_devices_tui(monitor_port: str, config: DaemonConfig) -> None:
     """
     Main monitoring loop that watches for devices and flashes them.
@@ -314,27 +598,47 @@ def _monitor_devices_tui(monitor_port: str, config: DaemonConfig) -> None:
         monitor_port: USB port to monitor (e.g., "1-2")
         config: Daemon configuration
     """
-    global _tui_shutdown_requested, _tui_port_states, _tui_flash_executor, _tui_image_mmap
+    global _tui_shutdown_requested, _tui_port_states, _tui_states_snapshot, _tui_downstream_snapshot
+    global _tui_image_mmap
     
-    # Create thread pool for parallel flashing
-    _tui_flash_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="flash")
+    # Start worker threads for parallel flashing
+    for i in range(_TUI_FLASH_WORKERS):
+        threading.Thread(target=_flash_worker, name=f"flash_{i}", daemon=True).start()
     
-    logger.info(f"Starting device monitoring on port {monitor_port}")
-    logger.info(f"Monitoring for block devices, stable_delay={config.stable_delay}s")
+    logger.info("Starting device monitoring on port %s", monitor_port)
+    logger.info("Monitoring for block devices, stable_delay=%ss", config.stable_delay)
     
-    poll_interval = 1.0  # Poll every second
+    poll_interval = 1.0  # Run the state machine every second (stable_delay progression)
+    rescan_interval = 5.0  # Safety re-enumeration when no uevent arrived
+    
+    # Re-enumerate only when the kernel reports a USB/block change; without
+    # uevents (or once the listener stops), fall back to enumerating on every poll
+    usb_changed = threading.Event()
+    uevent_listener = watch_usb_events(usb_changed)
+    downstream_ports = {}
+    current_port_strings = set()
+    last_enumeration = None
     
     try:
         while not _tui_shutdown_requested:
             try:
                 current_time = time.time()
+                event_driven = uevent_listener is not None and uevent_listener.is_alive()
                 
                 # Enumerate USB ports
-                ports_data = enumerate_all_usb_ports()
-                
-                # Filter to downstream ports
-                downstream_ports = filter_ports_by_limit(ports_data, monitor_port)
-                current_port_strings = set(downstream_ports.keys())
+                if (not event_driven or usb_changed.is_set() or last_enumeration is None
+                        or current_time - last_enumeration >= rescan_interval):
+                    # Clear first so changes during enumeration trigger another pass
+                    usb_changed.clear()
+                    ports_data = enumerate_all_usb_ports()
+                    last_enumeration = current_time
+                    
+                    # Filter to downstream ports (shared with the render loop)
+                    downstream_ports = filter_ports_by_limit(ports_data, monitor_port)
+                    current_port_strings = set(downstream_ports.keys())
+                    if downstream_ports != _tui_downstream_snapshot:
+                        _tui_downstream_snapshot = downstream_ports
+                        _tui_render_dirty.set()
                 
                 # Process each downstream port
                 for port_str, port_info in downstream_ports.items():
@@ -346,178 +650,42 @@ def _monitor_devices_tui(monitor_port: str, config: DaemonConfig) -> None:
                     port_state = _tui_port_states.get(port_str, {})
                     current_state = port_state.get('state', NOT_CONNECTED)
                     block_devices = port_info.get('block_devices', [])
-                    is_rpiboot = is_rpiboot_device(port_info)
                     
                     # State transition logic (same as daemon)
-                    if current_state == NOT_CONNECTED:
-                        # Port was empty or newly detected
-                        if block_devices:
-                            # Block device detected directly
-                            logger.info(f"Block device detected at port {port_str}: {block_devices}")
-                            _tui_port_states[port_str] = {
-                                'state': WAITING,
-                                'block_devices': block_devices.copy(),
-                                'detected_time': current_time,
-                                'progress': {},
-                                'error': None
-                            }
-                        elif is_rpiboot:
-                            # rpiboot-compatible device detected (no block devices yet)
-                            logger.info(f"rpiboot-compatible device detected at port {port_str}, starting rpiboot")
-                            _tui_port_states[port_str] = {
-                                'state': BOOTING,
-                                'block_devices': [],
-                                'detected_time': current_time,
-                                'progress': {},
-                                'error': None,
-                                'boot_stage': 'Starting rpiboot...'
-                            }
-                            
-                            # Execute rpiboot in background thread with stage tracking
-                            def handle_rpiboot_completion(port: str, states: Dict[str, dict]):
-                                # Create stage callback to update boot_stage in port state
-                                def stage_callback(stage: str):
-                                    if port in states:
-                                        states[port]['boot_stage'] = stage
-                                
-                                try:
-                                    success = boot_rpiboot_device(port, timeout=60.0, stage_callback=stage_callback)
-                                    if port in states:
-                                        if success:
-                                            logger.info(f"rpiboot completed successfully for port {port}, waiting for block device")
-                                        else:
-                                            states[port]['state'] = FAILED
-                                            states[port]['error'] = 'rpiboot failed'
-                                            logger.error(f"rpiboot failed for port {port}")
-                                except Exception as e:
-                                    if port in states:
-                                        states[port]['state'] = FAILED
-                                        states[port]['error'] = str(e)
-                                    logger.error(f"Unexpected error during rpiboot for port {port}: {e}")
-                            
-                            # Start rpiboot in background thread
-                            threading.Thread(
-                                target=handle_rpiboot_completion,
-                                args=(port_str, _tui_port_states),
-                                daemon=True
-                            ).start()
-                        elif port_info.get('vendor_id') is not None or port_info.get('product_id') is not None:
-                            # Device connected but not rpiboot and no block devices
-                            _tui_port_states[port_str] = {
-                                'state': UNKNOWN,
-                                'block_devices': [],
-                                'detected_time': current_time,
-                                'progress': {},
-                                'error': None
-                            }
-                    
-                    elif current_state == BOOTING:
-                        # rpiboot is running - check if block device appeared
-                        if block_devices:
-                            # Block device appeared after rpiboot
-                            logger.info(f"Block device appeared at port {port_str} after rpiboot: {block_devices}")
-                            _tui_port_states[port_str]['state'] = WAITING
-                            _tui_port_states[port_str]['block_devices'] = block_devices.copy()
-                            _tui_port_states[port_str]['detected_time'] = current_time
-                    
-                    elif current_state == WAITING:
-                        # Block device detected, waiting for stable_delay
-                        _tui_port_states[port_str]['block_devices'] = block_devices.copy()
-                        
-                        if not block_devices:
-                            # Block device disappeared while waiting
-                            logger.warning(f"Block device disappeared at port {port_str} while waiting")
-                            _tui_port_states[port_str]['state'] = NOT_CONNECTED
-                        else:
-                            # Check if stable_delay has elapsed
-                            detected_time = _tui_port_states[port_str].get('detected_time', current_time)
-                            time_since_detection = current_time - detected_time
-                            
-                            if time_since_detection >= config.stable_delay:
-                                # Device is stable, start flashing
-                                logger.info(f"Device at port {port_str} is stable, starting flash operation")
-                                
-                                if not _tui_image_mmap:
-                                    logger.error("Memory-mapped image not available, cannot flash device")
-                                    _tui_port_states[port_str]['state'] = FAILED
-                                    _tui_port_states[port_str]['error'] = 'Image not available'
-                                    continue
-                                
-                                # Update state to FLASHING before submitting jobs
-                                _tui_port_states[port_str]['state'] = FLASHING
-                                _tui_port_states[port_str]['progress'] = {
-                                    'bytes_written': 0,
-                                    'total_bytes': 0,
-                                    'percent': 0.0,
-                                    'start_time': current_time
-                                }
-                                
-                                # Flash all block devices on this port
-                                for device in block_devices:
-                                    future = _tui_flash_executor.submit(
-                                        flash_device,
-                                        _tui_image_mmap,
-                                        device,
-                                        config.block_size,
-                                        config.image_path,
-                                        port_str,
-                                        _tui_port_states
-                                    )
-                    
-                    elif current_state == FLASHING:
-                        # Flashing in progress - state updated by flash_device callback
-                        _tui_port_states[port_str]['block_devices'] = block_devices.copy()
-                    
-                    elif current_state == COMPLETED:
-                        # Flash completed - wait for device removal
-                        _tui_port_states[port_str]['block_devices'] = block_devices.copy()
-                        if not block_devices:
-                            # Device removed after completion
-                            logger.info(f"Flashed device at port {port_str} has been removed")
-                            _tui_port_states.pop(port_str, None)
-                    
-                    elif current_state == FAILED:
-                        # Failed state - keep tracking until device is removed
-                        _tui_port_states[port_str]['block_devices'] = block_devices.copy()
-                        if not block_devices:
-                            # Device removed after failure
-                            logger.debug(f"Failed device at port {port_str} has been removed")
-                            _tui_port_states.pop(port_str, None)
-                    
-                    elif current_state == UNKNOWN:
-                        # Unknown device - check if it got block devices or was removed
-                        if block_devices:
-                            # Block device appeared - transition to waiting
-                            logger.info(f"Block device appeared at port {port_str}: {block_devices}")
-                            _tui_port_states[port_str]['state'] = WAITING
-                            _tui_port_states[port_str]['block_devices'] = block_devices.copy()
-                            _tui_port_states[port_str]['detected_time'] = current_time
-                        elif port_info.get('vendor_id') is None and port_info.get('product_id') is None:
-                            # Device removed
-                            _tui_port_states.pop(port_str, None)
+                    _STATE_HANDLERS[current_state](port_str, port_info, block_devices, current_time, config)
                 
                 # Clean up ports that no longer exist
                 for port_str in list(_tui_port_states.keys()):
                     if port_str not in current_port_strings:
-                        logger.debug(f"Port {port_str} no longer present, cleaning up")
+                        logger.debug("Port %s no longer present, cleaning up", port_str)
                         _tui_port_states.pop(port_str, None)
                 
             except Exception as e:
-                logger.error(f"Error during monitoring cycle: {e}", exc_info=True)
+                logger.error("Error during monitoring cycle: %s", e, exc_info=True)
+            
+            # Publish a snapshot for the render loop (atomic rebind). Entries are
+            # shallow copies, so in-place progress updates from flash workers
+            # remain visible between polls.
+            states_snapshot = {k: v.copy() for k, v in list(_tui_port_states.items())}
+            if states_snapshot != _tui_states_snapshot:
+                _tui_states_snapshot = states_snapshot
+                _tui_render_dirty.set()
             
-            # Sleep until next poll
-            time.sleep(poll_interval)
+            # Sleep until next poll, waking early on USB changes
+            usb_changed.wait(timeout=poll_interval)
     
     finally:
         # Shutdown requested
         flashing_count = sum(1 for state in _tui_port_states.values() if state.get('state') == FLASHING)
         if flashing_count > 0:
-            logger.info(f"Shutdown requested, interrupting {flashing_count} in-progress flash operation(s)...")
+            logger.info("Shutdown requested, interrupting %d in-progress flash operation(s)...", flashing_count)
         else:
             logger.info("Shutdown requested")
         
-        if _tui_flash_executor:
-            _tui_flash_executor.shutdown(wait=False)
+        # Stop the flash workers once queued jobs are picked up. Running flash
+        # operations will be interrupted when the process exits (daemon threads).
+        for _ in range(_TUI_FLASH_WORKERS):
+            _tui_flash_queue.put_nowait(None)
         
         # Clean up memory-mapped image
         if _tui_image_mmap:
@@ -526,6 +694,27 @@ def _monitor_devices_tui(monitor_port: str, config: DaemonConfig) -> None:
             except Exception:
                 pass
             _tui_image_mmap = None
+        
+        # Wake the render loop so it notices the monitor thread has exited
+        _tui_render_dirty.set()
+
+
+def _watch_quit_key(keyboard_fd: int) -> None:
+    """Request a graceful shutdown when 'q' is pressed (runs in a background thread)."""
+    global _tui_shutdown_requested
+    
+    while not _tui_shutdown_requested:
+        try:
+            rlist, _, _ = select.select([keyboard_fd], [], [], 0.2)
+            if rlist:
+                char = sys.stdin.read(1)
+                if char and char.lower() == 'q':
+                    logger.info("Quit key ('q') pressed, initiating graceful shutdown...")
+                    _tui_shutdown_requested = True
+                    _tui_render_dirty.set()
+        except Exception:
+            # Ignore keyboard read errors, but don't spin on them
+            time.sleep(0.2)
 
 
 def run_tui(
@@ -548,7 +737,7 @@ def run_tui(
     Returns:
         Exit code (0 for success, non-zero for error)
     """
-    global _tui_shutdown_requested, _tui_image_mmap, _tui_flash_executor
+    global _tui_shutdown_requested, _tui_image_mmap, _tui_downstream_snapshot
     
     try:
         # Create configuration from provided parameters
@@ -577,8 +766,7 @@ def run_tui(
         
         # Create and configure TUI handler
         tui_handler = TUIHandler()
-        tui_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s', 
-                                                   datefmt='%Y-%m-%d %H:%M:%S'))
+        tui_handler.setFormatter(_tui_log_formatter)
         
         # Set log level from config
         level_map = {
@@ -628,6 +816,9 @@ def run_tui(
                 _tui_image_mmap = None
             return 1
         
+        # Show the initial enumeration until the monitor thread publishes its own
+        _tui_downstream_snapshot = filter_ports_by_limit(ports_data, monitor_port)
+        
         # Start monitoring in background thread
         monitor_thread = threading.Thread(
             target=_monitor_devices_tui,
@@ -655,41 +846,47 @@ def run_tui(
                 logger.debug(f"Could not setup keyboard input: {e}")
                 keyboard_fd = None
         
+        # Watch for 'q' key press in the background so the render loop can block
+        keyboard_thread = None
+        if keyboard_fd is not None:
+            keyboard_thread = threading.Thread(
+                target=_watch_quit_key,
+                args=(keyboard_fd,),
+                daemon=True
+            )
+            keyboard_thread.start()
+        
         try:
-            with Live(console=console, screen=True, refresh_per_second=10) as live:
+            # Refresh manually, only when the layout was rebuilt
+            with Live(console=console, screen=True, auto_refresh=False) as live:
+                current_layout = None
                 while not _tui_shutdown_requested:
-                    # Check for 'q' key press (non-blocking)
-                    if keyboard_fd is not None:
-                        try:
-                            rlist, _, _ = select.select([keyboard_fd], [], [], 0)
-                            if rlist:
-                                char = sys.stdin.read(1)
-                                if char and char.lower() == 'q':
-                                    logger.info("Quit key ('q') pressed, initiating graceful shutdown...")
-                                    _tui_shutdown_requested = True
-                                    break
-                        except Exception:
-                            # Ignore keyboard read errors
-                            pass
-                    
-                    # Get current ports data for display
-                    try:
-                        ports_data = enumerate_all_usb_ports()
-                    except Exception:
-                        ports_data = {}
+                    # Get current downstream ports for display (enumerated by the monitor thread)
+                    ports_data = _tui_downstream_snapshot
                     
-                    # Update layout
-                    layout = _create_layout(config, monitor_port, ports_data)
-                    live.update(layout)
+                    # Update and redraw only when the layout was rebuilt
+                    layout = _create_layout(config, monitor_port, ports_data, console)
+                    if layout is not current_layout:
+                        live.update(layout, refresh=True)
+                        current_layout = layout
                     
                     # Check if monitor thread is still alive
                     if not monitor_thread.is_alive():
                         break
                     
-                    time.sleep(0.1)  # Update every 0.1 seconds
+                    # Wait for a visible change; the timeout keeps time-based
+                    # text (waiting time, flash speed) ticking
+                    _tui_render_dirty.wait(timeout=2.0)
+                    _tui_render_dirty.clear()
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
         finally:
+            if _tui_shutdown_signal is not None:
+                logger.info("Received signal %s, initiating graceful shutdown...", _tui_shutdown_signal)
+            _tui_shutdown_requested = True
+            if keyboard_thread is not None:
+                keyboard_thread.join(timeout=0.5)
+            
             # Restore terminal settings if we modified them
             if keyboard_fd is not None and old_term_settings is not None:
                 try:
@@ -697,7 +894,6 @@ def run_tui(
                 except Exception:
                     pass
             
-            _tui_shutdown_requested = True
             # Wait a bit for cleanup
             monitor_thread.join(timeout=2.0)
         
@@ -1,146 +1,432 @@
 """USB device enumeration functionality."""
 
+import atexit
+import errno
+import functools
+import io
 import json
 import logging
 import os
 import platform
+import socket
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
-# Path to USB sysfs
-USB_SYSFS_PATH = Path("/sys/bus/usb/devices")
+# Path to USB sysfs (string form for building per-port paths on the hot path)
+_USB_SYSFS_STR = "/sys/bus/usb/devices"
+USB_SYSFS_PATH = Path(_USB_SYSFS_STR)
 
+# Path to block devices in sysfs
+SYS_BLOCK_PATH = Path("/sys/block")
 
-def _read_file_safe(path, default=None):
+# Platform and sysfs availability, probed once at import
+_IS_LINUX = platform.system() == 'Linux'
+_SYSFS_AVAILABLE = _IS_LINUX and USB_SYSFS_PATH.exists()
+
+# sysfs attributes read for every USB device; none of them change while the
+# device stays connected, and devnum changes whenever a new device is attached
+_USB_DEVICE_ATTRS = ("idVendor", "idProduct", "manufacturer", "product", "serial", "maxchild", "devnum")
+
+# Attributes of connected devices from earlier enumerations: port string -> attrs
+_device_attrs_cache = {}
+
+# Shared read-only device info for every port with nothing connected
+_EMPTY_PORT = types.MappingProxyType({
+    "vendor_id": None,
+    "product_id": None,
+    "manufacturer": None,
+    "product": None,
+    "serial": None,
+    "block_devices": ()
+})
+
+# Shared directory fd for _USB_SYSFS_STR, opened lazily by _sysfs_dir_fd()
+_sysfs_dir_fd_value = None
+_sysfs_dir_fd_lock = threading.Lock()
+
+# Attribute fds kept open across enumerations (path relative to _USB_SYSFS_STR -> fd),
+# in least-recently-used order; guarded by _sysfs_fd_cache_lock. A reader takes its
+# fd out of the dict while using it, so eviction never closes an fd in use.
+_sysfs_fd_cache = {}
+_sysfs_fd_cache_lock = threading.Lock()
+_SYSFS_FD_CACHE_SIZE = 512
+
+# Upper bound on threads used to enumerate USB buses concurrently, and the
+# pool of them, created lazily by _bus_executor() and reused across calls
+_MAX_BUS_WORKERS = 8
+_bus_executor_value = None
+_bus_executor_lock = threading.Lock()
+
+# Port numbers as strings, for building port strings without formatting
+# (Linux hubs have at most 31 ports)
+_NUM_STR = tuple(str(port_num) for port_num in range(128))
+
+# rpiboot-compatible (vendor_id, product_id) pairs: BCM2712 and BCM2711 boot ROMs
+_RPIBOOT_IDS = frozenset({("0x0a5c", "0x2712"), ("0x0a5c", "0x2711")})
+
+# Netlink protocol and multicast group for kernel uevents
+NETLINK_KOBJECT_UEVENT = 15
+_UEVENT_KERNEL_GROUP = 1
+
+
+def _bus_executor():
     """
-    Safely read a file from sysfs, returning default if file doesn't exist.
+    Get the thread pool used to enumerate USB buses concurrently.
+    
+    The pool is kept for the life of the process, so monitors that enumerate
+    every few seconds do not start and join new threads on each pass.
+    
+    Returns:
+        ThreadPoolExecutor: Shared executor with up to _MAX_BUS_WORKERS threads
+    """
+    global _bus_executor_value
+    with _bus_executor_lock:
+        if _bus_executor_value is None:
+            _bus_executor_value = ThreadPoolExecutor(max_workers=_MAX_BUS_WORKERS,
+                                                     thread_name_prefix="usb-enum")
+        return _bus_executor_value
+
+
+def _sysfs_dir_fd():
+    """
+    Get a shared directory fd for /sys/bus/usb/devices.
+    
+    Opened on first use and kept open for the life of the process, so
+    per-device opens relative to it only walk the device name instead of
+    the whole absolute path.
+    
+    Returns:
+        int: Open directory file descriptor
+        
+    Raises:
+        OSError: If the directory cannot be opened
+    """
+    global _sysfs_dir_fd_value
+    with _sysfs_dir_fd_lock:
+        if _sysfs_dir_fd_value is None:
+            _sysfs_dir_fd_value = os.open(_USB_SYSFS_STR, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+            atexit.register(os.close, _sysfs_dir_fd_value)
+        return _sysfs_dir_fd_value
+
+
+def _read_sysfs_value(path, dir_fd=None):
+    """
+    Read one small sysfs attribute file with a single os.read().
     
     Args:
-        path: Path to the file
-        default: Default value to return if file doesn't exist
+        path: Path to the attribute file, relative to dir_fd if given
+        dir_fd: Optional directory fd that path is relative to
         
     Returns:
-        str: File contents stripped, or default value
+        str: Stripped file contents, or None if the file cannot be read
     """
     try:
-        if path.exists():
-            return path.read_text().strip()
-    except (IOError, OSError, PermissionError) as e:
-        logger.debug(f"Could not read {path}: {e}")
-    return default
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC, dir_fd=dir_fd)
+        try:
+            return os.read(fd, 4096).decode(errors="replace").strip()
+        finally:
+            os.close(fd)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug("Could not read %s: %s", path, e)
+    return None
 
 
-def _get_maxchild(device_path):
+def _read_sysfs_value_cached(path, dir_fd):
     """
-    Get the maximum number of child ports for a USB device (hub).
+    Read a sysfs attribute through a file descriptor kept open across calls.
+    
+    sysfs regenerates an attribute's contents on every read at offset 0, so
+    a cached fd re-read with os.pread() replaces open/read/close with a
+    single syscall. A fd whose device went away fails to read; it is then
+    closed and the path is opened afresh.
     
     Args:
-        device_path: Path to the USB device in sysfs
+        path: Path to the attribute file, relative to dir_fd
+        dir_fd: Directory fd that path is relative to
+        
+    Returns:
+        str: Stripped file contents, or None if the file cannot be read
+    """
+    # A reader pops the fd out of the cache and owns it until it is put back,
+    # so the lock only guards the dict and is never held across I/O. Any fd
+    # found in the cache is idle, so it is safe to close when evicted.
+    with _sysfs_fd_cache_lock:
+        fd = _sysfs_fd_cache.pop(path, None)
+    
+    data = None
+    if fd is not None:
+        try:
+            data = os.pread(fd, 4096, 0)
+        except OSError:
+            os.close(fd)
+            fd = None
+    
+    if fd is None:
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC, dir_fd=dir_fd)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.debug("Could not open %s: %s", path, e)
+            return None
+        try:
+            data = os.pread(fd, 4096, 0)
+        except OSError as e:
+            logger.debug("Could not read %s: %s", path, e)
+            os.close(fd)
+            return None
+    
+    # (Re)insert as most recently used and evict the oldest beyond the limit;
+    # another thread may have cached its own fd for the same path meanwhile
+    evicted = []
+    with _sysfs_fd_cache_lock:
+        other = _sysfs_fd_cache.pop(path, None)
+        if other is not None:
+            evicted.append(other)
+        _sysfs_fd_cache[path] = fd
+        while len(_sysfs_fd_cache) > _SYSFS_FD_CACHE_SIZE:
+            evicted.append(_sysfs_fd_cache.pop(next(iter(_sysfs_fd_cache))))
+    for old_fd in evicted:
+        os.close(old_fd)
+    
+    return data.decode(errors="replace").strip()
+
+
+def _evict_sysfs_fd(path):
+    """
+    Close and forget the cached fd of a sysfs attribute, if any.
+    
+    Args:
+        path: Path to the attribute file, as passed to _read_sysfs_value_cached()
+    """
+    with _sysfs_fd_cache_lock:
+        fd = _sysfs_fd_cache.pop(path, None)
+        if fd is not None:
+            os.close(fd)
+
+
+def close_sysfs_fd_cache():
+    """
+    Close all sysfs attribute fds kept open across enumerations.
+    
+    Registered with atexit; long-running callers may also call it directly.
+    """
+    with _sysfs_fd_cache_lock:
+        for fd in _sysfs_fd_cache.values():
+            os.close(fd)
+        _sysfs_fd_cache.clear()
+
+
+atexit.register(close_sysfs_fd_cache)
+
+
+def _read_sysfs_attrs(device_path, names, dir_fd=None):
+    """
+    Read several small sysfs attribute files of one device.
+    
+    The device directory is opened once and each file is opened relative
+    to it (no exists() pre-check) and read with a single os.read(); missing
+    files map to None.
+    
+    Args:
+        device_path: Path to the device in sysfs, relative to dir_fd if given
+        names: Attribute file names to read
+        dir_fd: Optional directory fd that device_path is relative to
+        
+    Returns:
+        dict: Mapping of attribute name to stripped contents, or None
+    """
+    attrs = dict.fromkeys(names)
+    try:
+        device_fd = os.open(device_path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC, dir_fd=dir_fd)
+    except OSError as e:
+        logger.debug("Could not open %s: %s", device_path, e)
+        return attrs
+    try:
+        for name in names:
+            attrs[name] = _read_sysfs_value(name, device_fd)
+    finally:
+        os.close(device_fd)
+    return attrs
+
+
+def _parse_maxchild(maxchild_str):
+    """
+    Parse the contents of a maxchild attribute.
+    
+    Args:
+        maxchild_str: maxchild file contents, or None
         
     Returns:
         int: Number of ports, or 0 if not a hub
     """
-    maxchild_file = device_path / "maxchild"
-    maxchild_str = _read_file_safe(maxchild_file, "0")
     try:
         return int(maxchild_str)
-    except ValueError:
+    except (TypeError, ValueError):
         return 0
 
 
-def _enumerate_ports_recursive(bus_num, parent_path, parent_port_str=""):
+def _get_maxchild(device_path):
     """
-    Recursively enumerate all USB ports starting from a parent device.
+    Get the maximum number of child ports for a USB device (hub).
+    
+    Args:
+        device_path: Path to the USB device in sysfs (str or Path)
+        
+    Returns:
+        int: Number of ports, or 0 if not a hub
+    """
+    return _parse_maxchild(_read_sysfs_attrs(device_path, ("maxchild",))["maxchild"])
+
+
+def _list_device_dir(device_path):
+    """
+    List the entries of a USB device directory in sysfs.
+    
+    Child devices of a hub appear as subdirectories named after their port
+    string (e.g., "1-2.3" below "1-2"), so one listing tells which ports are
+    populated without a stat per port.
+    
+    Args:
+        device_path: Path to the USB device in sysfs (str or Path)
+        
+    Returns:
+        set: Entry names, or an empty set if the directory cannot be read
+    """
+    try:
+        return set(os.listdir(device_path))
+    except OSError as e:
+        logger.debug("Could not list %s: %s", device_path, e)
+        return set()
+
+
+def _port_num_strs(maxchild):
+    """
+    Get the port numbers 1..maxchild of a hub as strings.
+    
+    Args:
+        maxchild: Number of ports on the hub
+        
+    Returns:
+        sequence: "1", "2", ... str(maxchild)
+    """
+    if maxchild < len(_NUM_STR):
+        return _NUM_STR[1:maxchild + 1]
+    return [str(port_num) for port_num in range(1, maxchild + 1)]
+
+
+def _enumerate_ports_iter(bus_num, root_path, block_index=None):
+    """
+    Enumerate all USB ports below a root hub.
+    
+    Walks the hub tree depth-first with an explicit stack, so ports are
+    inserted in the same order a recursive walk would produce.
     
     Args:
         bus_num: USB bus number
-        parent_path: Path to the parent USB device in sysfs
-        parent_port_str: Port string of parent (e.g., "1-2")
+        root_path: Path to the root hub (e.g., /sys/bus/usb/devices/usb1)
+        block_index: Optional index from _build_block_device_index()
         
     Returns:
         dict: Dictionary mapping port strings to device info dictionaries
     """
     ports = {}
-    maxchild = _get_maxchild(parent_path)
-    
-    if maxchild == 0:
-        # Not a hub, no child ports
-        return ports
     
-    # Check each port on this hub
-    for port_num in range(1, maxchild + 1):
-        # Construct port string (e.g., "1-2.3" for port 3 on hub 1-2)
-        if parent_port_str:
-            port_str = f"{parent_port_str}.{port_num}"
-        else:
-            port_str = f"{bus_num}-{port_num}"
-        
-        # Check if device exists at this port
-        device_name = port_str
-        device_path = USB_SYSFS_PATH / device_name
-        
-        if device_path.exists() and device_path.is_dir():
-            # Device is connected at this port
-            device_info = _get_usb_device_info(device_path, port_str)
-            ports[port_str] = device_info
-            
-            # Recursively enumerate ports on this device (if it's a hub)
-            child_ports = _enumerate_ports_recursive(bus_num, device_path, port_str)
-            ports.update(child_ports)
-        else:
+    # Pending (port string, populated) pairs, pushed in reverse so they pop in ascending order
+    sysfs_fd = _sysfs_dir_fd()
+    populated = _list_device_dir(root_path)
+    stack = []
+    prefix = f"{bus_num}-"
+    for num_str in reversed(_port_num_strs(_get_maxchild(root_path))):
+        port_str = prefix + num_str
+        stack.append((port_str, port_str in populated))
+    
+    while stack:
+        port_str, is_populated = stack.pop()
+        
+        if not is_populated:
             # Port is empty
-            ports[port_str] = {
-                "vendor_id": None,
-                "product_id": None,
-                "manufacturer": None,
-                "product": None,
-                "serial": None,
-                "block_devices": []
-            }
+            ports[port_str] = _EMPTY_PORT
+            continue
+        
+        # Device is connected at this port; reuse its attributes from an earlier
+        # enumeration unless devnum shows a different device was attached since
+        device_path = f"{_USB_SYSFS_STR}/{port_str}"
+        attrs = _device_attrs_cache.get(port_str)
+        if (attrs is None or attrs["devnum"] is None
+                or attrs["devnum"] != _read_sysfs_value_cached(f"{port_str}/devnum", sysfs_fd)):
+            attrs = _read_sysfs_attrs(port_str, _USB_DEVICE_ATTRS, sysfs_fd)
+            _device_attrs_cache[port_str] = attrs
+        ports[port_str] = _get_usb_device_info(device_path, port_str, attrs, block_index)
+        
+        # Queue the ports on this device (if it's a hub), e.g. "1-2.3" for port 3 on hub 1-2
+        maxchild = _parse_maxchild(attrs["maxchild"])
+        if maxchild:
+            populated = _list_device_dir(device_path)
+            prefix = port_str + "."
+            for num_str in reversed(_port_num_strs(maxchild)):
+                child_str = prefix + num_str
+                stack.append((child_str, child_str in populated))
     
     return ports
 
 
-def _get_usb_device_info(device_path, port_str):
+@functools.lru_cache(maxsize=4096)
+def _port_key(port_str):
+    """
+    Get the natural sort key of a port string.
+    
+    The same port strings are sorted on every enumeration pass, so keys are memoized.
+    
+    Args:
+        port_str: Port string identifier (e.g., "1-2.10")
+        
+    Returns:
+        tuple: Numeric components (e.g., (1, 2, 10)), so "1-2.9" sorts before "1-2.10"
+    """
+    bus, _, ports = port_str.partition('-')
+    return (int(bus),) + tuple(map(int, ports.split('.')))
+
+
+def _get_usb_device_info(device_path, port_str, attrs=None, block_index=None):
     """
     Get USB device information from sysfs.
     
     Args:
-        device_path: Path to the USB device in sysfs
+        device_path: Path to the USB device in sysfs (str or Path)
         port_str: Port string identifier (e.g., "1-2.3")
+        attrs: Attributes already read with _read_sysfs_attrs(), if any
+        block_index: Optional index from _build_block_device_index()
         
     Returns:
         dict: Dictionary with device information
     """
-    # Read vendor and product IDs
-    vendor_id = _read_file_safe(device_path / "idVendor")
-    product_id = _read_file_safe(device_path / "idProduct")
-    
-    # Format vendor/product IDs with 0x prefix
-    if vendor_id:
-        try:
-            vendor_id = f"0x{vendor_id.lower()}"
-        except ValueError:
-            pass
+    if attrs is None:
+        attrs = _read_sysfs_attrs(device_path, _USB_DEVICE_ATTRS)
     
-    if product_id:
-        try:
-            product_id = f"0x{product_id.lower()}"
-        except ValueError:
-            pass
+    # Read vendor and product IDs, formatted with 0x prefix
+    vendor_id = attrs["idVendor"]
+    product_id = attrs["idProduct"]
+    vendor_id = f"0x{vendor_id.lower()}" if vendor_id else None
+    product_id = f"0x{product_id.lower()}" if product_id else None
     
     # Read manufacturer, product, and serial strings
-    manufacturer = _read_file_safe(device_path / "manufacturer")
-    product = _read_file_safe(device_path / "product")
-    serial = _read_file_safe(device_path / "serial")
+    manufacturer = attrs["manufacturer"]
+    product = attrs["product"]
+    serial = attrs["serial"]
     
     # Find block devices
-    block_devices = _find_block_devices(device_path, port_str)
+    block_devices = _find_block_devices(device_path, port_str, block_index=block_index)
     
     return {
-        "vendor_id": vendor_id if vendor_id else None,
-        "product_id": product_id if product_id else None,
+        "vendor_id": vendor_id,
+        "product_id": product_id,
         "manufacturer": manufacturer if manufacturer else None,
         "product": product if product else None,
         "serial": serial if serial else None,
@@ -167,11 +453,6 @@ def _get_related_bus_ports(port_str, raw_ports=None):
     if raw_ports is None:
         return ports
     
-    # Try to find USB 3.0 counterpart
-    # Extract the hub part to check hub relations
-    parts = port_str.split('.', 1)
-    hub_port = parts[0]
-    
     # Build hub relations if not already available
     hub_relations = _build_hub_relations(raw_ports)
     
@@ -183,7 +464,87 @@ def _get_related_bus_ports(port_str, raw_ports=None):
     return ports
 
 
-def _find_block_devices(device_path, port_str, raw_ports=None):
+def _block_device_sysfs_path(block_entry):
+    """
+    Get the sysfs device path of a /sys/block entry.
+    
+    /sys/block entries are symlinks into /sys/devices, so a single
+    readlink() yields the full device path (including the USB port
+    components) without canonicalizing every component like resolve().
+    
+    Args:
+        block_entry: Path or os.DirEntry of the entry in /sys/block (e.g., /sys/block/sda)
+        
+    Returns:
+        str: Absolute sysfs path of the block device
+        
+    Raises:
+        OSError: If the path cannot be read
+    """
+    link = os.fspath(block_entry)
+    try:
+        target = os.readlink(link)
+    except OSError:
+        # Not a symlink (deprecated sysfs layout), follow the device link instead
+        return os.path.realpath(os.path.join(link, "device"))
+    if target.startswith('/'):
+        return target
+    return os.path.normpath(os.path.join(os.path.dirname(link), target))
+
+
+def _usb_port_of_block_device(resolved_str):
+    """
+    Get the USB port a block device is attached to directly.
+    
+    Args:
+        resolved_str: Resolved sysfs path of the block device
+        
+    Returns:
+        str: Deepest USB port string in the path (e.g., "1-2.3"), or None
+    """
+    port = None
+    for part in resolved_str.split('/'):
+        # Port strings look like "<bus>-<port>[.<port>...]"; interfaces
+        # ("1-2.3:1.0") and root hubs ("usb1") don't match
+        bus, sep, rest = part.partition('-')
+        if sep and bus.isdigit() and rest and rest.replace('.', '').isdigit():
+            port = part
+    return port
+
+
+def _build_block_device_index():
+    """
+    Map USB ports to the block devices attached directly to them.
+    
+    Scans /sys/block once so that a whole enumeration pass costs one
+    symlink resolution per block device instead of one per block device
+    per USB port.
+    
+    Returns:
+        dict: Dictionary mapping port strings to lists of block device paths
+    """
+    index = {}
+    try:
+        with os.scandir(SYS_BLOCK_PATH) as entries:
+            # /sys/block lists whole disks only; partitions live below them
+            for block_name in entries:
+                try:
+                    port = _usb_port_of_block_device(_block_device_sysfs_path(block_name))
+                except (OSError, RuntimeError) as e:
+                    logger.debug("Error resolving device link for %s: %s", block_name.name, e)
+                    continue
+                
+                # devtmpfs creates /dev/<name> for every block device, so no stat is needed
+                if port is not None:
+                    index.setdefault(port, []).append("/dev/" + block_name.name)
+    except FileNotFoundError:
+        pass
+    except (IOError, OSError, PermissionError) as e:
+        logger.debug("Error scanning /sys/block: %s", e)
+    return index
+
+
+def _find_block_devices(device_path, port_str, raw_ports=None, block_index=None):
     """
     Find block devices associated with a USB device.
     
@@ -191,9 +552,11 @@ def _find_block_devices(device_path, port_str, raw_ports=None):
     block devices that may be connected via USB 3.0.
     
     Args:
-        device_path: Path to the USB device in sysfs
+        device_path: Path to the USB device in sysfs (str or Path)
         port_str: Port string identifier (unified representation)
         raw_ports: Optional raw ports dictionary for finding USB 3.0 counterpart
+        block_index: Optional index from _build_block_device_index(); if given,
+                     it is used instead of scanning sysfs for this call
         
     Returns:
         list: List of block device paths (e.g., ["/dev/sda"])
@@ -206,87 +569,50 @@ def _find_block_devices(device_path, port_str, raw_ports=None):
         related_ports = _get_related_bus_ports(port_str, raw_ports)
         ports_to_check = related_ports
     
+    if block_index is not None:
+        for check_port in ports_to_check:
+            block_devices.extend(block_index.get(check_port, ()))
+        return sorted(set(block_devices))
+    
     # Check if this device has a block/ subdirectory
-    block_dir = device_path / "block"
-    if block_dir.exists() and block_dir.is_dir():
+    block_dir = Path(device_path) / "block"
+    if block_dir.is_dir():
         # Get all block device names
-        for block_name in block_dir.iterdir():
-            if block_name.is_dir():
-                dev_path = Path(f"/dev/{block_name.name}")
-                if dev_path.exists():
-                    block_devices.append(str(dev_path))
+        with os.scandir(block_dir) as entries:
+            for block_name in entries:
+                if block_name.is_dir():
+                    block_devices.append("/dev/" + block_name.name)
     
-    # Alternative: scan /sys/block and match via USB device path
+    # Alternative: match via the USB device path of each /sys/block entry
     # USB storage devices go through SCSI, so we need to follow the path up to find USB device
     if not block_devices:
-        try:
-            sys_block = Path("/sys/block")
-            if sys_block.exists():
-                for block_name in sys_block.iterdir():
-                    # Skip partitions (they have numbers after the base name like sda1, sda2)
-                    # Only check base devices (sda, sdb, etc.)
-                    if len(block_name.name) > 3 and block_name.name[3:].isdigit():
-                        continue
-                    
-                    # Check if this block device is associated with our USB device
-                    device_link = sys_block / block_name.name / "device"
-                    if device_link.exists():
-                        try:
-                            # Follow symlink and check if port string appears in path
-                            resolved = device_link.resolve()
-                            resolved_str = str(resolved)
-                            
-                            # Check if any of our port strings appears in the resolved path
-                            # USB devices are at paths like: .../usb1/1-2/1-2.3/...
-                            # Match port string as a complete component (not substring)
-                            # Use path components to avoid false matches (e.g., "1-2" matching "1-2.3")
-                            path_parts = resolved_str.split('/')
-                            
-                            # Check all port representations (USB 2.0 and USB 3.0)
-                            port_found = False
-                            for check_port in ports_to_check:
-                                for part in path_parts:
-                                    # Check if this part exactly matches our port string
-                                    if part == check_port:
-                                        # Make sure no other part is a child of this port
-                                        # (e.g., if port_str is "1-2", we don't want to match if "1-2.3" exists)
-                                        is_parent = False
-                                        for other_part in path_parts:
-                                            if other_part.startswith(check_port + '.'):
-                                                is_parent = True
-                                                break
-                                        if not is_parent:
-                                            port_found = True
-                                            break
-                                if port_found:
-                                    break
-                            
-                            if port_found:
-                                dev_path = Path(f"/dev/{block_name.name}")
-                                if dev_path.exists():
-                                    block_devices.append(str(dev_path))
-                        except (OSError, RuntimeError) as e:
-                            logger.debug(f"Error resolving device link for {block_name.name}: {e}")
-                            pass
-        except (IOError, OSError, PermissionError) as e:
-            logger.debug(f"Error scanning /sys/block: {e}")
-    
-    return sorted(block_devices)
-
-
-def _is_hub(port_str, ports_data):
-    """
-    Check if a port is a hub (has child ports).
+        block_index = _build_block_device_index()
+        for check_port in ports_to_check:
+            block_devices.extend(block_index.get(check_port, ()))
+    
+    return sorted(set(block_devices))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_port(port_str):
+    """
+    Parse a port string into its bus number and top-level hub port.
+    
+    The same port strings recur in every unification pass, so results are memoized.
     
     Args:
-        port_str: Port string identifier
-        ports_data: Dictionary mapping port strings to device info
+        port_str: Port string identifier (e.g., "3-1.4")
         
     Returns:
-        bool: True if port is a hub, False otherwise
+        tuple: (bus_num, hub_port), e.g. (3, "3-1"), or None if the port string is malformed
     """
-    port_prefix = port_str + "."
-    return any(p.startswith(port_prefix) for p in ports_data.keys())
+    dash = port_str.find('-')
+    try:
+        bus_num = int(port_str[:dash] if dash >= 0 else port_str)
+    except ValueError:
+        return None
+    dot = port_str.find('.')
+    return bus_num, port_str[:dot] if dot >= 0 else port_str
 
 
 def _build_hub_relations(raw_ports):
@@ -304,11 +630,14 @@ def _build_hub_relations(raw_ports):
     """
     relations = {}
     
+    # Ports with child ports, i.e. hubs
+    hubs = _parent_set(raw_ports)
+    
     for port_str, port_info in raw_ports.items():
-        try:
-            bus_num = int(port_str.split('-')[0])
-        except (ValueError, IndexError):
+        parsed = _parse_port(port_str)
+        if parsed is None:
             continue
+        bus_num = parsed[0]
         
         # Only process USB 2.0 buses (odd numbers: 1, 3, 5, ...)
         # Note: This assumes USB 2.0 buses are odd and USB 3.0 are even
@@ -317,7 +646,7 @@ def _build_hub_relations(raw_ports):
             continue
         
         # Check if this is a hub
-        if not _is_hub(port_str, raw_ports):
+        if port_str not in hubs:
             continue
         
         # Check for USB 3.0 counterpart on next bus
@@ -329,53 +658,50 @@ def _build_hub_relations(raw_ports):
             # Check if same vendor (same physical hub)
             if (usb3_info.get('vendor_id') == port_info.get('vendor_id') and
                 usb3_info.get('vendor_id') is not None and
-                _is_hub(usb3_port, raw_ports)):
+                usb3_port in hubs):
                 relations[port_str] = usb3_port
     
     return relations
 
 
-def _find_usb2_counterpart(usb3_port_str, hub_relations):
+def _find_usb2_counterpart(usb3_port_str, hub_relations, usb3_to_usb2=None):
     """
     Find the USB 2.0 counterpart of a USB 3.0 port.
     
     Args:
         usb3_port_str: USB 3.0 port string (e.g., "4-1.4")
         hub_relations: Dictionary mapping USB 2.0 hub -> USB 3.0 hub
+        usb3_to_usb2: Optional inverse of hub_relations, so callers looking up
+                      many ports avoid scanning hub_relations each time
         
     Returns:
         USB 2.0 port string if found, None otherwise
     """
-    try:
-        bus_num = int(usb3_port_str.split('-')[0])
-    except (ValueError, IndexError):
+    parsed = _parse_port(usb3_port_str)
+    if parsed is None:
         return None
     
     # USB 3.0 buses are even, USB 2.0 are odd
+    # The hub part is e.g. "4-1" for "4-1.4"
+    bus_num, usb3_hub = parsed
     if bus_num % 2 != 0:
         return None
     
-    # Extract the hub part (e.g., "4-1" from "4-1.4")
-    parts = usb3_port_str.split('.', 1)
-    usb3_hub = parts[0]
-    
     # Find USB 2.0 hub counterpart
-    usb2_hub = None
-    for usb2_hub_port, usb3_hub_port in hub_relations.items():
-        if usb3_hub_port == usb3_hub:
-            usb2_hub = usb2_hub_port
-            break
+    if usb3_to_usb2 is not None:
+        usb2_hub = usb3_to_usb2.get(usb3_hub)
+    else:
+        usb2_hub = None
+        for usb2_hub_port, usb3_hub_port in hub_relations.items():
+            if usb3_hub_port == usb3_hub:
+                usb2_hub = usb2_hub_port
+                break
     
     if usb2_hub is None:
         return None
     
-    # Reconstruct USB 2.0 port string
-    if len(parts) > 1:
-        # Has sub-ports (e.g., "4-1.4" -> "3-1.4")
-        return usb3_port_str.replace(usb3_hub, usb2_hub, 1)
-    else:
-        # Just the hub itself
-        return usb2_hub
+    # Reconstruct USB 2.0 port string, keeping any sub-ports (e.g., "4-1.4" -> "3-1.4")
+    return usb2_hub + usb3_port_str[len(usb3_hub):]
 
 
 def _find_usb3_counterpart(usb2_port_str, hub_relations):
@@ -389,31 +715,23 @@ def _find_usb3_counterpart(usb2_port_str, hub_relations):
     Returns:
         USB 3.0 port string if found, None otherwise
     """
-    try:
-        bus_num = int(usb2_port_str.split('-')[0])
-    except (ValueError, IndexError):
+    parsed = _parse_port(usb2_port_str)
+    if parsed is None:
         return None
     
     # USB 2.0 buses are odd, USB 3.0 are even
+    # The hub part is e.g. "3-1" for "3-1.4"
+    bus_num, usb2_hub = parsed
     if bus_num % 2 == 0:
         return None
     
-    # Extract the hub part (e.g., "3-1" from "3-1.4")
-    parts = usb2_port_str.split('.', 1)
-    usb2_hub = parts[0]
-    
     # Find USB 3.0 hub counterpart
     usb3_hub = hub_relations.get(usb2_hub)
     if usb3_hub is None:
         return None
     
-    # Reconstruct USB 3.0 port string
-    if len(parts) > 1:
-        # Has sub-ports (e.g., "3-1.4" -> "4-1.4")
-        return usb2_port_str.replace(usb2_hub, usb3_hub, 1)
-    else:
-        # Just the hub itself
-        return usb3_hub
+    # Reconstruct USB 3.0 port string, keeping any sub-ports (e.g., "3-1.4" -> "4-1.4")
+    return usb3_hub + usb2_port_str[len(usb2_hub):]
 
 
 def _merge_port_info(usb2_info, usb3_info):
@@ -461,23 +779,24 @@ def unify_ports(raw_ports):
     unified = {}
     processed_usb3_ports = set()
     
-    # Build hub relationship map
+    # Build hub relationship map, and its inverse for USB 3.0 -> USB 2.0 lookups
     hub_relations = _build_hub_relations(raw_ports)
+    usb3_to_usb2 = {usb3_hub: usb2_hub for usb2_hub, usb3_hub in hub_relations.items()}
     
     for port_str, port_info in raw_ports.items():
         # Skip USB 3.0 ports that will be merged
-        try:
-            bus_num = int(port_str.split('-')[0])
-        except (ValueError, IndexError):
+        parsed = _parse_port(port_str)
+        if parsed is None:
             # Invalid port format, include as-is
             unified[port_str] = port_info
             continue
+        bus_num = parsed[0]
         
         # Check if this is a USB 3.0 port (even bus number)
         # Note: This assumes USB 2.0 buses are odd and USB 3.0 are even
         if bus_num % 2 == 0:
             # Check if this port has a USB 2.0 counterpart
-            usb2_port = _find_usb2_counterpart(port_str, hub_relations)
+            usb2_port = _find_usb2_counterpart(port_str, hub_relations, usb3_to_usb2)
             if usb2_port:
                 processed_usb3_ports.add(port_str)
                 continue
@@ -504,42 +823,89 @@ def enumerate_all_usb_ports():
     a single entry (each physical port appears exactly once).
     
     Returns:
-        dict: Dictionary mapping port strings to device info dictionaries
+        dict: Dictionary mapping port strings to device info dictionaries, in port order
         
     Raises:
         RuntimeError: If not running on Linux or sysfs is not available
     """
     # Check if we're on Linux
-    if platform.system() != 'Linux':
+    if not _IS_LINUX:
         raise RuntimeError("USB enumeration is only supported on Linux")
     
     # Check if sysfs is available
-    if not USB_SYSFS_PATH.exists():
+    if not _SYSFS_AVAILABLE:
         raise RuntimeError(f"USB sysfs not found at {USB_SYSFS_PATH}. Is this a Linux system?")
     
     all_ports = {}
     
-    # Enumerate all USB buses
+    # Map block devices to USB ports once for the whole pass
+    block_index = _build_block_device_index()
+    
+    # Collect all USB buses (root hubs)
+    buses = []
     try:
-        for bus_entry in USB_SYSFS_PATH.iterdir():
-            if bus_entry.name.startswith("usb") and bus_entry.is_dir():
-                # Extract bus number from name (e.g., "usb1" -> 1)
-                try:
-                    bus_num = int(bus_entry.name[3:])
-                except ValueError:
-                    logger.debug(f"Could not parse bus number from {bus_entry.name}")
-                    continue
-                
-                # Enumerate ports on this bus
-                bus_ports = _enumerate_ports_recursive(bus_num, bus_entry, "")
-                all_ports.update(bus_ports)
+        with os.scandir(_USB_SYSFS_STR) as entries:
+            for bus_entry in entries:
+                # Entries are symlinks, so only root hubs ("usb*") pay for the is_dir() stat
+                if bus_entry.name.startswith("usb") and bus_entry.is_dir():
+                    # Extract bus number from name (e.g., "usb1" -> 1)
+                    try:
+                        bus_num = int(bus_entry.name[3:])
+                    except ValueError:
+                        logger.debug("Could not parse bus number from %s", bus_entry.name)
+                        continue
+                    buses.append((bus_num, bus_entry.path))
+        
+        # Enumerate ports on each bus; the walks are syscall-bound and release
+        # the GIL, so independent buses run concurrently
+        def enumerate_bus(bus):
+            return _enumerate_ports_iter(bus[0], bus[1], block_index)
+        
+        if len(buses) > 1:
+            bus_results = list(_bus_executor().map(enumerate_bus, buses))
+        else:
+            bus_results = [enumerate_bus(bus) for bus in buses]
+        
+        for bus_ports in bus_results:
+            all_ports.update(bus_ports)
+        
+        # Forget cached attributes and fds of devices that are gone
+        for port_str in list(_device_attrs_cache):
+            if all_ports.get(port_str, _EMPTY_PORT) is _EMPTY_PORT:
+                del _device_attrs_cache[port_str]
+                _evict_sysfs_fd(f"{port_str}/devnum")
     except (IOError, OSError, PermissionError) as e:
         raise RuntimeError(f"Error reading USB sysfs: {e}")
     
     # Unify USB 2.0/3.0 port pairs
     unified_ports = unify_ports(all_ports)
     
-    return unified_ports
+    # Return ports in port order so output needs no further sorting
+    return dict(sorted(unified_ports.items(), key=lambda item: _port_key(item[0])))
+
+
+def _parent_set(ports):
+    """
+    Build the set of ports that have at least one downstream port.
+    
+    Every ancestor of a port string (e.g., "1-2" and "1-2.3" for "1-2.3.1")
+    is added, so membership answers "has children?" in O(1).
+    
+    Args:
+        ports: Iterable of port strings
+        
+    Returns:
+        set: Port strings that have child ports
+    """
+    parents = set()
+    for port_str in ports:
+        while '.' in port_str:
+            port_str = port_str.rsplit('.', 1)[0]
+            if port_str in parents:
+                # Remaining ancestors were added along with this one
+                break
+            parents.add(port_str)
+    return parents
 
 
 def find_first_usb_hub(ports_data):
@@ -552,20 +918,12 @@ def find_first_usb_hub(ports_data):
         ports_data: Dictionary mapping port strings to device info
         
     Returns:
-        str: Port string of the first hub found, or None if no hub found
+        str: Port string of the first hub in port order, or None if no hub found
     """
-    # Sort ports to get consistent ordering
-    sorted_ports = sorted(ports_data.keys())
-    
-    for port_str in sorted_ports:
-        # Check if this port has children (indicating it's a hub)
-        port_prefix = port_str + "."
-        has_children = any(p.startswith(port_prefix) for p in ports_data.keys())
-        
-        if has_children:
-            return port_str
+    hubs = _parent_set(ports_data).intersection(ports_data)
     
-    return None
+    # Pick the lowest port in the same natural order the ports are output in
+    return min(hubs, key=_port_key, default=None)
 
 
 def filter_ports_by_limit(ports_data, limit_port):
@@ -579,20 +937,14 @@ def filter_ports_by_limit(ports_data, limit_port):
     Returns:
         dict: Filtered dictionary containing only the limit port and its downstream ports
     """
-    filtered = {}
-    
-    # Include the limit port itself if it exists
-    if limit_port in ports_data:
-        filtered[limit_port] = ports_data[limit_port]
-    
-    # Include all ports that are children of the limit port
-    # Children have the format: limit_port.port_num (e.g., "1-2.3")
+    # Include the limit port itself and all ports below it in one pass, keeping
+    # the input order. Children have the format: limit_port.port_num (e.g., "1-2.3")
     limit_prefix = limit_port + "."
-    for port_str, port_info in ports_data.items():
-        if port_str.startswith(limit_prefix):
-            filtered[port_str] = port_info
-    
-    return filtered
+    return {
+        port_str: port_info
+        for port_str, port_info in ports_data.items()
+        if port_str == limit_port or port_str.startswith(limit_prefix)
+    }
 
 
 def is_rpiboot_device(port_info: dict) -> bool:
@@ -605,21 +957,16 @@ def is_rpiboot_device(port_info: dict) -> bool:
     Returns:
         True if device matches rpiboot-compatible vendor:product IDs, False otherwise
     """
-    vendor_id = port_info.get("vendor_id")
-    product_id = port_info.get("product_id")
-    
-    # Check for rpiboot-compatible devices: 0x0a5c:0x2712 or 0x0a5c:0x2711
-    if vendor_id == "0x0a5c":
-        if product_id == "0x2712" or product_id == "0x2711":
-            return True
-    
-    return False
+    return (port_info.get("vendor_id"), port_info.get("product_id")) in _RPIBOOT_IDS
 
 
 def format_usb_output(ports_data, json_output=False):
     """
     Format USB port enumeration data for output.
     
+    Ports are output in the order of ports_data, which enumerate_all_usb_ports()
+    already returns in port order.
+    
     Args:
         ports_data: Dictionary mapping port strings to device info
         json_output: If True, return JSON string; otherwise return human-readable text
@@ -628,39 +975,87 @@ def format_usb_output(ports_data, json_output=False):
         str: Formatted output string
     """
     if json_output:
-        return json.dumps(ports_data, indent=2, sort_keys=True)
-    
-    # Human-readable format
-    lines = []
-    for port_str in sorted(ports_data.keys()):
-        info = ports_data[port_str]
+        # default=dict serializes the shared read-only _EMPTY_PORT mapping
+        return json.dumps(ports_data, indent=2, default=dict)
+    
+    # Human-readable format, one line per port
+    buf = io.StringIO()
+    write = buf.write
+    for port_str, info in ports_data.items():
+        write(port_str)
+        write(": ")
         
         # Check if port is empty
         if info["vendor_id"] is None and info["product_id"] is None:
-            lines.append(f"{port_str}: (empty)")
-        else:
-            # Build device description
-            parts = []
-            
-            # Vendor:Product IDs
-            if info["vendor_id"] and info["product_id"]:
-                parts.append(f"{info['vendor_id']}:{info['product_id']}")
-            
-            # Manufacturer and product names
-            name_parts = []
-            if info["manufacturer"]:
-                name_parts.append(info["manufacturer"])
-            if info["product"]:
-                name_parts.append(info["product"])
-            
-            if name_parts:
-                parts.append(" ".join(name_parts))
-            
-            # Block devices
-            if info["block_devices"]:
-                parts.append(f"[{', '.join(info['block_devices'])}]")
-            
-            line = f"{port_str}: {' '.join(parts)}"
-            lines.append(line)
-    
-    return "\n".join(lines)
+            write("(empty)\n")
+            continue
+        
+        # Space-separated description parts
+        sep = ""
+        
+        # Vendor:Product IDs
+        if info["vendor_id"] and info["product_id"]:
+            write(f"{info['vendor_id']}:{info['product_id']}")
+            sep = " "
+        
+        # Manufacturer and product names
+        for name in (info["manufacturer"], info["product"]):
+            if name:
+                write(sep)
+                write(name)
+                sep = " "
+        
+        # Block devices
+        if info["block_devices"]:
+            write(f"{sep}[{', '.join(info['block_devices'])}]")
+        
+        write("\n")
+    
+    return buf.getvalue().rstrip("\n")
+
+
+def watch_usb_events(changed):
+    """
+    Set an event whenever the kernel reports a USB or block device change.
+    
+    Listens on the kernel uevent netlink socket in a background daemon thread,
+    so callers can re-enumerate ports only when the topology actually changed
+    instead of polling sysfs unconditionally.
+    
+    Args:
+        changed: threading.Event to set on every USB/block uevent
+        
+    Returns:
+        threading.Thread: The listener thread, or None if uevents are unavailable.
+                          Callers should fall back to periodic enumeration when
+                          None is returned or once the thread is no longer alive.
+    """
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        sock.bind((0, _UEVENT_KERNEL_GROUP))
+    except (AttributeError, OSError) as e:
+        logger.debug("Kernel uevents not available, falling back to polling: %s", e)
+        return None
+    
+    def listen():
+        with sock:
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except OSError as e:
+                    if e.errno == errno.ENOBUFS:
+                        # A burst of uevents overflowed the receive buffer and
+                        # some were dropped; treat it as a change and keep going
+                        changed.set()
+                        continue
+                    logger.warning("Stopped listening for kernel uevents, falling back to polling: %s", e)
+                    changed.set()
+                    return
+                # Payload is "action@devpath\0KEY=VALUE\0KEY=VALUE..."
+                fields = data.split(b"\0")
+                if b"SUBSYSTEM=usb" in fields or b"SUBSYSTEM=block" in fields:
+                    changed.set()
+    
+    listener = threading.Thread(target=listen, name="uevent", daemon=True)
+    listener.start()
+    return listener
@@ -2,11 +2,18 @@
 
 import logging
 import os
+import re
 import stat
 import subprocess
 
 logger = logging.getLogger(__name__)
 
+# Supported image file extensions
+_IMAGE_EXTENSIONS = frozenset({".img", ".iso"})
+
+# Name prefixes of common disk devices (Linux and macOS)
+_DEVICE_NAME_PREFIXES = ("sd", "mmcblk", "nvme", "hd", "disk", "rdisk")
+
 
 def validate_image_file(path):
     """
@@ -18,41 +25,53 @@ def validate_image_file(path):
     Returns:
         tuple: (is_valid: bool, error_message: str or None)
     """
-    if not os.path.exists(path):
-        return False, f"File does not exist: {path}"
+    ext = os.path.splitext(path)[1].lower()
+    ext_error = f"Unsupported file extension: {ext}. Only .img and .iso files are supported."
 
-    if not os.path.isfile(path):
+    # Open once and check existence and type on the fd instead of stat-ing the path
+    # (O_NONBLOCK keeps a FIFO from blocking the open)
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+    except (FileNotFoundError, NotADirectoryError):
+        return False, f"File does not exist: {path}"
+    except IsADirectoryError:
         return False, f"Path is not a file: {path}"
+    except OSError as e:
+        # Report a wrong extension before a read error, as when the
+        # extension was checked ahead of opening the file
+        if ext not in _IMAGE_EXTENSIONS:
+            return False, ext_error
+        return False, f"Cannot read file: {e}"
 
-    # Check file extension
-    ext = os.path.splitext(path)[1].lower()
-    valid_extensions = {".img", ".iso"}
+    try:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return False, f"Path is not a file: {path}"
 
-    if ext not in valid_extensions:
-        return False, f"Unsupported file extension: {ext}. Only .img and .iso files are supported."
+        # Check file extension
+        if ext not in _IMAGE_EXTENSIONS:
+            return False, ext_error
 
-    # Check magic bytes
-    try:
-        with open(path, "rb") as f:
-            magic = f.read(8)
-
-        # ISO 9660 magic bytes (for .iso files)
-        # ISO 9660 files start with specific sector structure
-        if ext == ".iso":
-            # Check for ISO 9660 signature at offset 32768 (0x8000) or check first sector
-            # For simplicity, we'll check if it's a valid ISO by looking at common patterns
-            # Most ISO files have recognizable structure, but we'll be lenient
-            # and just verify it's not obviously wrong
-            if len(magic) < 8:
-                return False, "File appears to be empty or too small"
-        # For .img files, we'll accept any binary file as valid
-        # Raw disk images don't have a standard magic byte signature
-        elif ext == ".img":
-            if len(magic) < 1:
-                return False, "File appears to be empty"
-
-    except IOError as e:
+        # Check magic bytes
+        magic = os.read(fd, 8)
+    except OSError as e:
         return False, f"Cannot read file: {e}"
+    finally:
+        os.close(fd)
+
+    # ISO 9660 magic bytes (for .iso files)
+    # ISO 9660 files start with specific sector structure
+    if ext == ".iso":
+        # Check for ISO 9660 signature at offset 32768 (0x8000) or check first sector
+        # For simplicity, we'll check if it's a valid ISO by looking at common patterns
+        # Most ISO files have recognizable structure, but we'll be lenient
+        # and just verify it's not obviously wrong
+        if len(magic) < 8:
+            return False, "File appears to be empty or too small"
+    # For .img files, we'll accept any binary file as valid
+    # Raw disk images don't have a standard magic byte signature
+    elif ext == ".img":
+        if len(magic) < 1:
+            return False, "File appears to be empty"
 
     logger.debug(f"Image file validation passed: {path}")
     return True, None
@@ -68,25 +87,22 @@ def validate_block_device(path):
     Returns:
         tuple: (is_valid: bool, error_message: str or None)
     """
-    if not os.path.exists(path):
-        return False, f"Device does not exist: {path}"
-
     # Check if it's a block device or character device (rdisk on macOS)
     try:
         mode = os.stat(path).st_mode
-        if not (stat.S_ISBLK(mode) or stat.S_ISCHR(mode)):
-            return False, f"Path is not a block or character device: {path}"
+    except (FileNotFoundError, NotADirectoryError):
+        return False, f"Device does not exist: {path}"
     except OSError as e:
         return False, f"Cannot access device: {e}"
+    if not (stat.S_ISBLK(mode) or stat.S_ISCHR(mode)):
+        return False, f"Path is not a block or character device: {path}"
 
     # Check if it's a valid device path
     if not path.startswith("/dev/"):
         return False, f"Device path must start with /dev/: {path}"
 
     # Check for common device patterns
-    basename = os.path.basename(path)
-    valid_patterns = ["sd", "mmcblk", "nvme", "hd", "disk", "rdisk"]
-    if not any(basename.startswith(pattern) for pattern in valid_patterns):
+    if not os.path.basename(path).startswith(_DEVICE_NAME_PREFIXES):
         logger.warning(f"Device path doesn't match common patterns: {path}")
         # Don't fail, but warn - might be valid custom device
 
@@ -94,6 +110,40 @@ def validate_block_device(path):
     return True, None
 
 
+def _device_or_partition_pattern(basenames):
+    """
+    Compile a pattern matching device paths of the given devices or their partitions.
+
+    Partitions append digits to names ending in a letter (sda -> sda1), and
+    "p<n>" (Linux, mmcblk0 -> mmcblk0p1) or "s<n>" (macOS, disk4 -> disk4s1)
+    to names ending in a digit, so /dev/sda does not match /dev/sdaa.
+
+    Args:
+        basenames: Device basenames (e.g., ["sda"])
+
+    Returns:
+        re.Pattern: Pattern to search() in a mount device path
+    """
+    alternatives = []
+    for basename in basenames:
+        suffix = r"(?:p\d+|s\d+)?" if basename[-1:].isdigit() else r"\d*"
+        alternatives.append(re.escape(basename) + suffix)
+    return re.compile(r"(?:^|/)(?:%s)$" % "|".join(alternatives))
+
+
+def _unescape_mount_field(field):
+    """
+    Decode the octal escapes /proc/mounts uses for whitespace and backslashes.
+
+    Args:
+        field: Field from /proc/mounts (e.g., "/media/SD\\040Card")
+
+    Returns:
+        str: Unescaped field (e.g., "/media/SD Card")
+    """
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
 def is_mounted(device):
     """
     Check if a device or any of its partitions are mounted.
@@ -116,30 +166,30 @@ def is_mounted(device):
         disk_number = device_basename[5:]  # Remove "rdisk" prefix
         check_basenames.append(f"disk{disk_number}")
 
-    # Try /proc/mounts first (Linux)
+    device_pattern = _device_or_partition_pattern(check_basenames)
+
+    # Try /proc/mounts first (Linux); it is small, so read it in one go
     try:
         with open("/proc/mounts", "r") as f:
-            for line in f:
-                parts = line.split()
-                if len(parts) >= 1:
-                    mount_device = parts[0]
-                    mount_point = parts[1] if len(parts) > 1 else None
-
-                    # Check if this mount point uses our device or a partition
-                    mount_basename = os.path.basename(mount_device)
-
-                    # Match device or partition for any of the basenames we're checking
-                    for check_basename in check_basenames:
-                        if mount_basename.startswith(check_basename):
-                            if mount_point:
-                                mounted.append(mount_point)
-                            else:
-                                mounted.append(mount_device)
-                            break
-        return mounted
+            data = f.read()
     except IOError:
         # /proc/mounts doesn't exist (e.g., on macOS), fall back to mount command
-        pass
+        data = None
+
+    if data is not None:
+        # Nothing to parse if none of the device names appear at all
+        if not any(check_basename in data for check_basename in check_basenames):
+            return mounted
+
+        for line in data.splitlines():
+            parts = line.split()
+            # Match device or partition for any of the basenames we're checking
+            if parts and device_pattern.search(parts[0]):
+                if len(parts) > 1:
+                    mounted.append(_unescape_mount_field(parts[1]))
+                else:
+                    mounted.append(parts[0])
+        return mounted
 
     # Fall back to mount command (works on both Linux and macOS)
     try:
@@ -151,17 +201,9 @@ def is_mounted(device):
                 # Both Linux and macOS use similar format
                 parts = line.split()
                 if len(parts) >= 3 and parts[1] == "on":
-                    mount_device = parts[0]
-                    mount_point = parts[2]
-
-                    # Check if this mount point uses our device or a partition
-                    mount_basename = os.path.basename(mount_device)
-
                     # Match device or partition for any of the basenames we're checking
-                    for check_basename in check_basenames:
-                        if mount_basename.startswith(check_basename):
-                            mounted.append(mount_point)
-                            break
+                    if device_pattern.search(parts[0]):
+                        mounted.append(parts[2])
     except (subprocess.SubprocessError, FileNotFoundError) as e:
         logger.warning(f"Could not determine mounted filesystems: {e}")
 